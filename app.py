@@ -22,6 +22,7 @@ from invoices import Invoice, usd_to_rlusd, make_qr, save_invoice_pdf
 from xrpl_client import XRPLClient, XRPLConfig
 from vaultseal_receipt import make_receipt_vault, write_encrypted_vault, export_pdf
 from qb_export import write_qb_csv
+from artifact_store import ArtifactStore
 
 
 # ---------- Config ----------
@@ -43,6 +44,7 @@ seed        = CONFIG["xrpl"]["seed"]
 account     = CONFIG["xrpl"]["account"]
 rlusd_cfg   = CONFIG.get("rlusd", {})
 demo_mode   = (CONFIG.get("app", {}).get("env", "dev").lower() == "dev")
+store       = ArtifactStore(Path(CONFIG.get("storage", {}).get("root", ".payhub/store")))
 
 # ---------- App chrome ----------
 st.set_page_config(page_title="PayHub • RLUSD Invoicing", layout="centered")
@@ -107,10 +109,8 @@ if "invoice" in st.session_state:
     st.image(qr_png, caption="Scan to pay (demo URI)")
 
     # Invoice PDF
-    pdf_path = Path(".payhub/out") / f"{inv.invoice_id}.pdf"
-    pdf_path.parent.mkdir(parents=True, exist_ok=True)
-    save_invoice_pdf(inv, qr_png, pdf_path)
-    st.download_button("Download Invoice PDF", data=pdf_path.read_bytes(), file_name=pdf_path.name)
+    pdf_digest = save_invoice_pdf(inv, qr_png, store)
+    st.download_button("Download Invoice PDF", data=store.get(pdf_digest), file_name=f"{inv.invoice_id}.pdf")
 
     st.divider()
     st.subheader("Simulate / Confirm Payment")
@@ -156,13 +156,10 @@ if "invoice" in st.session_state:
             st.error("Provide a validated TX hash.")
         else:
             receipt = make_receipt_vault(inv.model_dump(), tx_hash)
-            vault_dir = Path(".payhub/out") / inv.invoice_id
-            vault_dir.mkdir(parents=True, exist_ok=True)
-            vault_path = write_encrypted_vault(receipt, vault_dir, password="ownYourImprint")
-            receipt_pdf = vault_dir / "receipt.pdf"
-            export_pdf(vault_path, receipt_pdf)
+            vault_digest = write_encrypted_vault(receipt, store, password="ownYourImprint")
+            receipt_digest = export_pdf(vault_digest, store, inv.invoice_id)
             st.success("Vault & PDF created.")
-            st.download_button("Download Receipt PDF", data=receipt_pdf.read_bytes(), file_name=receipt_pdf.name)
+            st.download_button("Download Receipt PDF", data=store.get(receipt_digest), file_name="receipt.pdf")
 
     st.divider()
     st.subheader("Export for QuickBooks / Xero")
@@ -177,7 +174,6 @@ if "invoice" in st.session_state:
             "XRPLTx": st.session_state.get("tx_hash", ""),
             "Memo": inv.memo,
         }]
-        csv_path = Path(".payhub/out") / f"{inv.invoice_id}.csv"
-        write_qb_csv(rows, csv_path)
-        st.download_button("Download CSV", data=csv_path.read_bytes(), file_name=csv_path.name)
+        csv_digest = write_qb_csv(rows, store, inv.invoice_id)
+        st.download_button("Download CSV", data=store.get(csv_digest), file_name=f"{inv.invoice_id}.csv")
 
@@ -0,0 +1,185 @@
+# artifact_store.py — content-addressed, sharded artifact storage for PayHub outputs
+#
+# Layout under the store root:
+#   objects/ab/cd/<sha256>   loose blobs, sharded on the first two hash bytes
+#   packs/<YYYY-MM>.zip      archived periods (deflated, members addressable by hash)
+#   index.sqlite             invoice_id/name -> sha256, plus where each blob lives
+import logging, os, re, shutil, sqlite3, sys, tempfile, zipfile
+from contextlib import closing
+from datetime import datetime, timezone
+from hashlib import sha256
+from pathlib import Path
+from typing import Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    digest TEXT PRIMARY KEY,
+    size   INTEGER NOT NULL,
+    pack   TEXT
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    invoice_id TEXT NOT NULL,
+    name       TEXT NOT NULL,
+    digest     TEXT NOT NULL REFERENCES objects(digest),
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (invoice_id, name)
+);
+CREATE INDEX IF NOT EXISTS artifacts_created ON artifacts(created_at);
+"""
+
+class ArtifactStore:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        with closing(self._db()) as db, db:
+            db.executescript(_SCHEMA)
+
+    def _db(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.root / "index.sqlite", timeout=30)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest[2:4] / digest
+
+    def _pack_path(self, period: str) -> Path:
+        return self.root / "packs" / f"{period}.zip"
+
+    def put(self, invoice_id: str, name: str, data: bytes) -> str:
+        """Store `data` as artifact `name` of `invoice_id`; identical content is kept once."""
+        digest = sha256(data).hexdigest()
+        op = self._object_path(digest)
+        ts = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with closing(self._db()) as db, db:
+            # Take the write lock up front so blob writes and orphan removal are serialized.
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute("SELECT pack FROM objects WHERE digest = ?", (digest,)).fetchone()
+            if row is None or (row[0] is None and not op.exists()):
+                op.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=op.parent, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f: f.write(data)
+                os.replace(tmp, op)
+                db.execute("INSERT OR REPLACE INTO objects (digest, size, pack) VALUES (?, ?, NULL)",
+                           (digest, len(data)))
+            prev = db.execute("SELECT digest FROM artifacts WHERE invoice_id = ? AND name = ?",
+                              (invoice_id, name)).fetchone()
+            # Unchanged content keeps its original created_at, so packing still follows creation time.
+            db.execute("INSERT INTO artifacts (invoice_id, name, digest, created_at) VALUES (?, ?, ?, ?) "
+                       "ON CONFLICT(invoice_id, name) DO UPDATE SET digest = excluded.digest, "
+                       "created_at = excluded.created_at WHERE digest != excluded.digest",
+                       (invoice_id, name, digest, ts))
+            if prev and prev[0] != digest:
+                self._drop_if_orphaned(db, prev[0])
+        return digest
+
+    def _drop_if_orphaned(self, db: sqlite3.Connection, digest: str):
+        """Remove a loose blob no artifact references any more; packed blobs stay in their archive."""
+        if db.execute("SELECT 1 FROM artifacts WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+            return
+        if db.execute("DELETE FROM objects WHERE digest = ? AND pack IS NULL", (digest,)).rowcount:
+            op = self._object_path(digest)
+            op.unlink(missing_ok=True)
+            self._prune_shards(op)
+
+    def _prune_shards(self, op: Path):
+        for shard in (op.parent, op.parent.parent):
+            try: shard.rmdir()
+            except OSError: break
+
+    def get(self, digest: str) -> bytes:
+        with closing(self._db()) as db:
+            row = db.execute("SELECT pack FROM objects WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            raise KeyError(digest)
+        if row[0] is None:
+            return self._object_path(digest).read_bytes()
+        with zipfile.ZipFile(self._pack_path(row[0])) as zf:
+            return zf.read(digest)
+
+    def artifacts(self, invoice_id: str) -> Dict[str, str]:
+        """Map of artifact name -> digest for one invoice."""
+        with closing(self._db()) as db:
+            rows = db.execute("SELECT name, digest FROM artifacts WHERE invoice_id = ? ORDER BY name",
+                              (invoice_id,)).fetchall()
+        return dict(rows)
+
+    def read(self, invoice_id: str, name: str) -> bytes:
+        digest = self.artifacts(invoice_id).get(name)
+        if digest is None:
+            raise KeyError(f"{invoice_id}/{name}")
+        return self.get(digest)
+
+    def loose_periods(self) -> List[str]:
+        """Periods (YYYY-MM) that still reference loose objects."""
+        with closing(self._db()) as db:
+            rows = db.execute(
+                "SELECT DISTINCT substr(a.created_at, 1, 7) FROM artifacts a "
+                "JOIN objects o ON o.digest = a.digest WHERE o.pack IS NULL ORDER BY 1"
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def pack(self, period: str) -> Optional[Path]:
+        """Move loose objects referenced in `period` (YYYY-MM) into packs/<period>.zip."""
+        with closing(self._db()) as db:
+            digests = [r[0] for r in db.execute(
+                "SELECT DISTINCT a.digest FROM artifacts a JOIN objects o ON o.digest = a.digest "
+                "WHERE o.pack IS NULL AND substr(a.created_at, 1, 7) = ?", (period,))]
+        if not digests:
+            return None
+        pp = self._pack_path(period)
+        pp.parent.mkdir(parents=True, exist_ok=True)
+        tmp = pp.with_suffix(".tmp")
+        # Re-packing a period keeps whatever the existing pack already holds.
+        mode = "a" if pp.exists() else "w"
+        if pp.exists():
+            shutil.copyfile(pp, tmp)
+        packed = []
+        with zipfile.ZipFile(tmp, mode, compression=zipfile.ZIP_DEFLATED) as zf:
+            have = set(zf.namelist())
+            for d in digests:
+                if d in have:
+                    packed.append(d)
+                elif self._object_path(d).exists():
+                    zf.write(self._object_path(d), arcname=d)
+                    packed.append(d)
+                else:
+                    log.warning("artifact_store: loose object %s is missing, not packed", d)
+        tmp.replace(pp)
+        digests = packed
+        with closing(self._db()) as db, db:
+            db.executemany("UPDATE objects SET pack = ? WHERE digest = ?", [(period, d) for d in digests])
+        for d in digests:
+            op = self._object_path(d)
+            op.unlink(missing_ok=True)
+            self._prune_shards(op)
+        return pp
+
+    def pack_older_than(self, days: int) -> List[Path]:
+        """Pack every loose period that ended more than `days` days ago."""
+        now = datetime.now(timezone.utc)
+        packed = []
+        for period in self.loose_periods():
+            y, m = map(int, period.split("-"))
+            end = datetime(y + m // 12, m % 12 + 1, 1, tzinfo=timezone.utc)
+            if (now - end).days >= days:
+                pp = self.pack(period)
+                if pp:
+                    packed.append(pp)
+        return packed
+
+_USAGE = ("Usage: python artifact_store.py <store_root> periods\n"
+          "       python artifact_store.py <store_root> pack <YYYY-MM>\n"
+          "       python artifact_store.py <store_root> pack --older-than <days>\n"
+          "Packing moves loose objects into packs/<YYYY-MM>.zip and deletes the loose copies.")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if len(args) == 2 and args[1] == "periods":
+        print("\n".join(ArtifactStore(Path(args[0])).loose_periods()))
+    elif len(args) == 3 and args[1] == "pack" and re.fullmatch(r"\d{4}-(0[1-9]|1[0-2])", args[2]):
+        pp = ArtifactStore(Path(args[0])).pack(args[2])
+        print(pp or f"nothing loose in {args[2]}")
+    elif len(args) == 4 and args[1:3] == ["pack", "--older-than"] and args[3].isdigit():
+        print("\n".join(map(str, ArtifactStore(Path(args[0])).pack_older_than(int(args[3])))))
+    else:
+        print(_USAGE); sys.exit(1)
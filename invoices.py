@@ -3,7 +3,7 @@ from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
 import qrcode
 from io import BytesIO
-from pathlib import Path
+from artifact_store import ArtifactStore
 
 class Invoice(BaseModel):
     invoice_id: str
@@ -32,13 +32,14 @@ def make_qr(data: str) -> BytesIO:
     bio.seek(0)
     return bio
 
-def save_invoice_pdf(invoice: Invoice, qr_png: BytesIO, out_path: Path):
+def save_invoice_pdf(invoice: Invoice, qr_png: BytesIO, store: ArtifactStore) -> str:
     from reportlab.lib.pagesizes import LETTER
     from reportlab.pdfgen import canvas
     from reportlab.lib.units import inch
     from reportlab.lib.utils import ImageReader
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    c = canvas.Canvas(str(out_path), pagesize=LETTER)
+    out = BytesIO()
+    # invariant=1 drops the creation timestamp so re-rendering the same invoice dedupes
+    c = canvas.Canvas(out, pagesize=LETTER, invariant=1)
     w, h = LETTER
     c.setFont("Helvetica-Bold", 16); c.drawString(1*inch, h-1*inch, f"Invoice #{invoice.invoice_id}")
     c.setFont("Helvetica", 10)
@@ -57,3 +58,4 @@ def save_invoice_pdf(invoice: Invoice, qr_png: BytesIO, out_path: Path):
     c.setFont("Helvetica-Oblique", 8)
     c.drawString(1*inch, 0.75*inch, "VaultSeal™ audit receipt on payment. Hash will be anchored to XRPL.")
     c.showPage(); c.save()
+    return store.put(invoice.invoice_id, f"{invoice.invoice_id}.pdf", out.getvalue())
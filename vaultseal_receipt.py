@@ -11,6 +11,7 @@ for p in ("./v1_production_release","../v1_production_release"):
 
 from vault_crypto import encrypt_vault_bytes  # core
 import pdf_exporter  # core
+from artifact_store import ArtifactStore
 
 def make_receipt_vault(invoice_dict: dict, xrpl_tx_hash: str) -> dict:
     ts = datetime.utcnow().isoformat(timespec="seconds") + "Z"
@@ -18,13 +19,10 @@ def make_receipt_vault(invoice_dict: dict, xrpl_tx_hash: str) -> dict:
     b = json.dumps(body, sort_keys=True).encode()
     return {"header":{"version":"2.0","app":"PayHub","schema":"payhub.receipt.v1","hash":sha256(b).hexdigest(),"created_at":ts},"body":body}
 
-def write_encrypted_vault(receipt_obj: dict, out_dir: Path, password: str) -> Path:
-    out_dir.mkdir(parents=True, exist_ok=True)
+def write_encrypted_vault(receipt_obj: dict, store: ArtifactStore, password: str) -> str:
     raw = json.dumps(receipt_obj, sort_keys=True).encode()
     enc = encrypt_vault_bytes(raw, password=password)
-    vp = out_dir / "receipt.vault"
-    with open(vp, "wb") as f: f.write(enc)
-    return vp
+    return store.put(receipt_obj["body"]["invoice"]["invoice_id"], "receipt.vault", enc)
 
-def export_pdf(vault_path: Path, out_pdf: Path):
-    pdf_exporter.main(str(vault_path), str(out_pdf))
+def export_pdf(vault_digest: str, store: ArtifactStore, invoice_id: str) -> str:
+    return pdf_exporter.main(vault_digest, store, invoice_id)